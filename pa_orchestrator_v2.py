@@ -15,28 +15,48 @@ import re
 from datetime import datetime
 import io
 import json
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from pathlib import Path
+
+# ── Optional API clients (imported lazily on first use) ───────────────────────
+def _has_modules(*names) -> bool:
+    try:
+        return all(find_spec(n) is not None for n in names)
+    except ModuleNotFoundError:      # parent package of a dotted name is missing
+        return False
 
-# ── Safe-load API clients ─────────────────────────────────────────────────────
-try:
-    from twilio.rest import Client as TwilioClient
-    from sendgrid import SendGridAPIClient
-    from sendgrid.helpers.mail import Mail
-    APIS_AVAILABLE = True
-except ImportError:
-    APIS_AVAILABLE = False
 
-try:
-    import gspread
-    from google.oauth2.service_account import Credentials
-    GSPREAD_AVAILABLE = True
-except ImportError:
-    GSPREAD_AVAILABLE = False
+APIS_AVAILABLE    = _has_modules("twilio", "sendgrid")
+GSPREAD_AVAILABLE = _has_modules("gspread", "google.oauth2")
 
 # ── Google Sheet config ───────────────────────────────────────────────────────
 SHEET_ID     = "1aTY9CICa-jEsIOLKNhimUT78YxqreKG3"
 GVIZ_BASE    = f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/gviz/tq?tqx=out:csv&sheet="
 SHEET_NAMES  = ["Database", "Email_Templates", "Interaction_History", "Simulation_Log"]
 SCOPES       = ["https://www.googleapis.com/auth/spreadsheets"]
+# Cache TTL (seconds) per tab, matched to how often each one changes
+TAB_TTLS     = {
+    "Database":            60,
+    "Email_Templates":     86400,   # effectively static
+    # Log tabs are only appended to by the app (kept current via write-through),
+    # so an occasional reconcile is enough; a full A:ZZ read of a growing log is costly
+    "Interaction_History": 600,
+    "Simulation_Log":      600,
+}
+
+GS_RETRY_AFTER = 60                 # seconds before retrying a failed Sheets setup / refresh
+
+# Column order of the log tabs (must match the sheet's header rows)
+HISTORY_COLS = ["Timestamp", "Org_ID", "Findings_Summary", "Draft_Email", "Draft_SMS", "Draft_Voicemail"]
+SIM_COLS     = ["Timestamp", "Org_ID", "Final_Outcome", "Action_Taken", "Sent_To"]
+LOG_COLUMNS  = {"Interaction_History": HISTORY_COLS, "Simulation_Log": SIM_COLS}
+
+_PHONE_STRIP = re.compile(r"[-\s()]")   # separators removed before dialing
 
 # ── Page config ───────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -47,91 +67,355 @@ st.set_page_config(
 )
 
 # ── Custom CSS ────────────────────────────────────────────────────────────────
-st.markdown("""
-<style>
-    .stApp { background-color: #f8f9fa; }
-    .flag-card {
-        background: #fff3cd; border-left: 4px solid #ffc107;
-        padding: 10px 16px; border-radius: 4px; margin: 6px 0;
-        font-size: 14px;
-    }
-    .clear-card {
-        background: #d1e7dd; border-left: 4px solid #198754;
-        padding: 10px 16px; border-radius: 4px; margin: 6px 0;
-        font-size: 14px;
-    }
-    .rule-badge {
-        background: #0d6efd; color: white;
-        padding: 4px 12px; border-radius: 20px;
-        font-size: 13px; font-weight: 600;
-    }
-    .stage-header {
-        font-size: 22px; font-weight: 700; color: #212529;
-        border-bottom: 2px solid #0d6efd; padding-bottom: 8px;
-        margin-bottom: 16px;
-    }
-    .gs-badge {
-        background: #34a853; color: white;
-        padding: 3px 10px; border-radius: 12px;
-        font-size: 12px; font-weight: 600;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data
+def load_css() -> str:
+    """Read styles.css once per process."""
+    return (Path(__file__).parent / "styles.css").read_text()
+
+
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 # GOOGLE SHEETS LAYER
 # ══════════════════════════════════════════════════════════════════════════════
 
-@st.cache_data(ttl=120)          # re-fetch every 2 minutes
-def load_sheet_tab(tab_name: str) -> pd.DataFrame:
+def prepare_database(db: pd.DataFrame) -> pd.DataFrame:
+    """Normalize the yes/no flag columns once at load time so reruns read booleans."""
+    def is_yes(col): return db[col].astype(str).str.strip().str.lower().eq("yes")
+
+    db["_pbi"]      = is_yes("Org_PBI_Status")
+    db["_tax"]      = is_yes("Outgoing PA Tax Exempt")
+    db["_no_acct"]  = ~is_yes("Incoming PA existing account")
+    db["_has_flag"] = db[["_pbi", "_tax", "_no_acct"]].any(axis=1)
+    # Index by org for constant-time lookups (column kept for display/filtering)
+    return db.set_index("Org name", drop=False).rename_axis(None)
+
+
+def prepare_tab(tab_name: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Apply per-tab load-time preparation (flags, lookup indexes)."""
+    if tab_name == "Database":
+        return prepare_database(df)
+    if tab_name == "Email_Templates":
+        return df.set_index("Template_Name", drop=False).rename_axis(None)
+    return df
+
+
+def lookup_row(df: pd.DataFrame, key):
+    """Index lookup returning the first matching row as a Series, or None if absent."""
+    if key not in df.index:
+        return None
+    hit = df.loc[key]
+    return hit.iloc[0] if isinstance(hit, pd.DataFrame) else hit
+
+
+@st.cache_resource(max_entries=1)
+def org_lists(_db: pd.DataFrame, load_id: str) -> dict:
+    """Org names per select-stage filter, built once per loaded Database frame (keyed by its load id)."""
+    names = _db["Org name"]
+    return {
+        "All":        names.tolist(),
+        "🚩 Flagged": names[_db["_has_flag"]].tolist(),
+        "✅ Clear":   names[~_db["_has_flag"]].tolist(),
+    }
+
+
+def append_frame_row(df: pd.DataFrame, row: dict):
+    """Append one dict row to df in place, aligned to its columns."""
+    df.loc[len(df)] = pd.Series(row).reindex(df.columns)
+
+
+class TabCache:
+    """Process-wide cache for one sheet tab. Past its TTL the last frame keeps being
+    served while load_all_sheets() refreshes it in the background."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock       = threading.Lock()
+        self._value      = None
+        self._fetched_at = 0.0
+        self._refreshing = False   # only one refresh in flight at a time
+        self._retry_at   = 0.0     # after a failed refresh, don't claim again before this
+
+    @property
+    def empty(self) -> bool:
+        return self._value is None
+
+    @property
+    def value(self):
+        return self._value
+
+    def claim_refresh(self) -> bool:
+        """True if the frame is past its TTL, no refresh is in flight and no failure
+        backoff is pending; marks one in flight."""
+        with self._lock:
+            now   = time.monotonic()
+            fresh = now - self._fetched_at <= self.ttl
+            if self._value is None or fresh or self._refreshing or now < self._retry_at:
+                return False
+            self._refreshing = True
+            return True
+
+    def release(self, failed: bool = False):
+        """Mark the in-flight refresh as finished; after a failure, back off GS_RETRY_AFTER s."""
+        with self._lock:
+            self._refreshing = False
+            if failed:
+                self._retry_at = time.monotonic() + GS_RETRY_AFTER
+
+    def clear(self):
+        """Drop the cached value so the next access reloads inline."""
+        with self._lock:
+            self._value, self._fetched_at = None, 0.0
+
+    def set(self, value):
+        """Store a freshly loaded frame, stamped with a unique load id for memo keys."""
+        value.attrs["load_id"] = uuid.uuid4().hex
+        with self._lock:
+            self._value, self._fetched_at = value, time.monotonic()
+
+    def append_row(self, row: dict):
+        """Write-through: add a row we just wrote to the sheet to the cached frame,
+        instead of dropping it. The next TTL refresh reconciles with the sheet."""
+        with self._lock:
+            df = self._value
+            if df is None:
+                return
+            if df.columns.empty:   # tab had no header row when loaded
+                self._value, self._fetched_at = None, 0.0
+                return
+            append_frame_row(df, row)
+
+
+def fetch_sheet_tab(tab_name: str) -> pd.DataFrame:
     """Load a single tab from Google Sheet via public CSV export (gviz endpoint)."""
     url = GVIZ_BASE + tab_name.replace(" ", "%20")
-    return pd.read_csv(url)
+    df  = pd.read_csv(url)
+    return prepare_tab(tab_name, df)
+
+
+def values_to_frame(values: list) -> pd.DataFrame:
+    """Build a DataFrame from a Sheets API values block (first row = headers)."""
+    if not values:
+        return pd.DataFrame()
+    headers, width = values[0], len(values[0])
+    # The API drops trailing empty cells, so pad/trim each row to the header width
+    rows = [(r + [""] * width)[:width] for r in values[1:]]
+    return pd.DataFrame(rows, columns=headers)
+
+
+def fetch_tabs(tab_names: list) -> dict:
+    """Fetch tabs as {tab_name: DataFrame}: one authenticated values.batchGet when
+    a service account is configured, otherwise the public gviz export per tab.
+
+    Note the two paths give differently typed frames: batchGet returns every cell as
+    a string (blank cells as ""), while gviz lets pandas infer types (CID as int,
+    blank cells as NaN). Falling back changes the frame types for that load.
+    """
+    resources = gs_resources_or_none()
+    if resources is not None:
+        try:
+            resp = resources[1].values_batch_get(
+                ranges=[f"{n}!A:ZZ" for n in tab_names],
+                params={"majorDimension": "ROWS"},
+            )
+            return {
+                name: prepare_tab(name, values_to_frame(v.get("values", [])))
+                for name, v in zip(tab_names, resp["valueRanges"])
+            }
+        except Exception as e:
+            reset_gs_resources(e)    # 401/403: re-authorize on the next call
+    return {name: fetch_sheet_tab(name) for name in tab_names}
+
+
+@st.cache_resource
+def get_tab_caches() -> dict:
+    """Shared per-tab caches, each with its own TTL."""
+    return {name: TabCache(ttl=TAB_TTLS[name]) for name in SHEET_NAMES}
+
+
+@st.cache_resource
+def get_refresh_executor() -> ThreadPoolExecutor:
+    """Single background worker for sheet refreshes."""
+    return ThreadPoolExecutor(max_workers=1)
+
+
+def sheet_cache(tab_name: str) -> TabCache:
+    """The cache for one tab, e.g. sheet_cache("Interaction_History").clear()."""
+    return get_tab_caches()[tab_name]
+
+
+def refresh_tabs(caches: dict, tab_names: list):
+    """Background job: reload the given tabs in one fetch and swap them in."""
+    failed = False
+    try:
+        for name, df in fetch_tabs(tab_names).items():
+            caches[name].set(df)
+    except Exception:
+        failed = True            # keep serving the stale frames; retried after the backoff
+    finally:
+        for name in tab_names:
+            caches[name].release(failed)
 
 
 def load_all_sheets():
     """Load all four tabs. Returns (db, templates, history, sim) DataFrames."""
-    db        = load_sheet_tab("Database")
-    templates = load_sheet_tab("Email_Templates")
-    history   = load_sheet_tab("Interaction_History")
-    sim       = load_sheet_tab("Simulation_Log")
-    return db, templates, history, sim
+    caches = get_tab_caches()
+    frames = {name: cache.value for name, cache in caches.items()}
+    empty  = [name for name, df in frames.items() if df is None]
+    if empty:                    # cold start / cleared: nothing to serve, load inline in one batch
+        for name, df in fetch_tabs(empty).items():
+            caches[name].set(df)
+            frames[name] = df
+    stale = [name for name, cache in caches.items() if cache.claim_refresh()]
+    if stale:                    # every expired tab in one background batch call
+        get_refresh_executor().submit(refresh_tabs, caches, stale)
+    return tuple(frames[name] for name in SHEET_NAMES)
+
+
+@st.cache_resource               # one authorized client per process, shared across sessions
+def get_gs_resources():
+    """Authorize gspread once and open the sheet. Returns (gc, sh, {tab_name: Worksheet})."""
+    sa_info = dict(st.secrets["gcp_service_account"])   # before the imports: fail fast if unset
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    creds   = Credentials.from_service_account_info(sa_info, scopes=SCOPES)
+    gc      = gspread.authorize(creds)
+    sh      = gc.open_by_key(SHEET_ID)
+    worksheets = {ws.title: ws for ws in sh.worksheets()}     # one metadata read for all tabs
+    missing    = [name for name in SHEET_NAMES if name not in worksheets]
+    if missing:
+        raise KeyError(f"Sheet is missing tab(s): {', '.join(missing)}")
+    return gc, sh, worksheets
+
+
+def has_service_account() -> bool:
+    """True if a service account is configured in Streamlit secrets."""
+    try:
+        return "gcp_service_account" in st.secrets
+    except Exception:            # no secrets.toml at all
+        return False
 
 
-def get_gspread_client():
-    """Authenticate gspread using service account JSON stored in Streamlit secrets."""
-    if not GSPREAD_AVAILABLE:
+@st.cache_resource
+def get_gs_failure() -> dict:
+    """Process-wide record of the last failed authorize/open, so reruns don't retry it."""
+    return {"retry_at": 0.0}
+
+
+def gs_resources_or_none():
+    """Cached gspread resources, or None if gspread / the service account is not configured.
+    A failed setup (sheet not shared, tab renamed) is not retried for GS_RETRY_AFTER seconds."""
+    if not GSPREAD_AVAILABLE or not has_service_account():
+        return None              # unconfigured: gspread / google-auth are never imported
+    failure = get_gs_failure()
+    if time.monotonic() < failure["retry_at"]:
         return None
     try:
-        sa_info = dict(st.secrets["gcp_service_account"])
-        creds   = Credentials.from_service_account_info(sa_info, scopes=SCOPES)
-        return gspread.authorize(creds)
+        return get_gs_resources()
     except Exception:
+        failure["retry_at"] = time.monotonic() + GS_RETRY_AFTER
         return None
 
 
-def append_to_sheet(tab_name: str, row_dict: dict):
-    """Append a row to the named sheet tab via gspread. Returns True on success."""
-    gc = get_gspread_client()
-    if gc is None:
+def reset_gs_resources(error: Exception):
+    """Drop the cached client on auth errors so the next call re-authorizes."""
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) in (401, 403):
+        get_gs_resources.clear()
+
+
+_NUMBER = re.compile(r"-?\d+(\.\d+)?")
+
+
+def sheet_value(v):
+    """Typed value for a log cell. USER_ENTERED is dropped on purpose: appendCells is
+    what gives atomic, server-positioned appends, and it stores values as given rather
+    than parsing them. Numbers (e.g. CID) are converted here so those columns stay
+    numeric. Everything else, including the ISO Timestamp, is stored as plain text;
+    if older rows in a column were parsed into dates, new rows in it will be text."""
+    if v is None or (not isinstance(v, str) and pd.isna(v)):
+        return ""
+    text = str(v)
+    if _NUMBER.fullmatch(text):
+        return float(text) if "." in text else int(text)
+    return text
+
+
+def sheet_cell(v) -> dict:
+    kind = "numberValue" if isinstance(v, (int, float)) else "stringValue"
+    return {"userEnteredValue": {kind: v}}
+
+
+def append_rows_batch(rows_by_tab: dict) -> bool:
+    """Append rows to several tabs in one spreadsheets.batchUpdate (appendCells) call.
+    The server picks the next empty row and grows the grid; all tabs or none are written.
+    Returns True on success.
+
+    rows_by_tab maps a LOG_COLUMNS tab name -> list of row dicts keyed by column name.
+    """
+    resources = gs_resources_or_none()
+    if resources is None:
         return False
+    _, sh, worksheets = resources
+    from gspread.exceptions import APIError     # gspread is installed if resources exist
+
+    values_by_tab = {
+        tab: [[sheet_value(r.get(c)) for c in LOG_COLUMNS[tab]] for r in rows]
+        for tab, rows in rows_by_tab.items()
+    }
+    body = {"requests": [
+        {"appendCells": {
+            "sheetId": worksheets[tab].id,
+            "rows":    [{"values": [sheet_cell(v) for v in row]} for row in values],
+            "fields":  "userEnteredValue",
+        }}
+        for tab, values in values_by_tab.items()
+    ]}
+
+    # A single batchUpdate is atomic: either every tab gets its row or none does.
+    # Retry 429s with truncated exponential backoff rather than writing tabs separately.
+    attempts = 5
+    for attempt in range(attempts):
+        try:
+            sh.batch_update(body)
+            return True
+        except APIError as e:
+            error, status = e, e.response.status_code
+            if status != 429 or attempt == attempts - 1:
+                break
+            time.sleep(2 ** attempt + random.random())
+        except Exception as e:
+            # Network error / timeout: the batch may already have been applied,
+            # so writing the tabs again could duplicate rows
+            st.warning(f"Could not write to Google Sheet: {e}")
+            return False
+
+    if status == 429:
+        st.warning("Could not write to Google Sheet: write quota exceeded (HTTP 429). No rows were written.")
+        return False
+    if not 400 <= status < 500 or status in (401, 403):
+        reset_gs_resources(error)
+        st.warning(f"Could not write to Google Sheet: {error}")
+        return False
+    # Fallback: per-tab append if the batch request itself was rejected (4xx)
     try:
-        sh  = gc.open_by_key(SHEET_ID)
-        ws  = sh.worksheet(tab_name)
-        # Match column order to existing headers
-        headers = ws.row_values(1)
-        row_values = [str(row_dict.get(h, "")) for h in headers]
-        ws.append_row(row_values, value_input_option="USER_ENTERED")
+        for tab, values in values_by_tab.items():
+            # RAW keeps the same typed values as the appendCells path (ints stay numbers)
+            worksheets[tab].append_rows(values, value_input_option="RAW")
         return True
     except Exception as e:
+        reset_gs_resources(e)
         st.warning(f"Could not write to Google Sheet: {e}")
         return False
 
 
 def clear_sheet_cache():
-    """Force reload of sheet data."""
-    load_sheet_tab.clear()
+    """Force reload of sheet data (and retry a failed Sheets setup right away)."""
+    get_gs_failure()["retry_at"] = 0.0
+    for cache in get_tab_caches().values():
+        cache.clear()
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -140,8 +424,9 @@ def clear_sheet_cache():
 
 def run_rules_engine(row, templates_df):
     """Determine the correct template and rule based on record flags."""
-    def yn(col): return str(row.get(col, "No")).strip().lower() == "yes"
-    def na(col): return str(row.get(col, "N/A")).strip().upper() == "N/A"
+    r = row.to_dict() if hasattr(row, "to_dict") else row   # plain dict gets, not Series dispatch
+    def yn(col): return str(r.get(col, "No")).strip().lower() == "yes"
+    def na(col): return str(r.get(col, "N/A")).strip().upper() == "N/A"
 
     has_account   = yn("Incoming PA existing account")
     is_pbi        = yn("Org_PBI_Status")
@@ -181,9 +466,9 @@ def run_rules_engine(row, templates_df):
         rule = "Rule 00 — Standard transfer. No special flags. Schedule call to proceed."
         clears += ["✅ No PBI flag", "✅ No Tax-Exempt flag", "✅ Incoming PA has existing account"]
 
-    trow = templates_df[templates_df["Template_Name"] == template_name]
-    subject       = trow["Default_Subject"].values[0] if not trow.empty else "Walmart Business Update"
-    template_body = trow["Body_Text"].values[0]       if not trow.empty else ""
+    trow = lookup_row(templates_df, template_name)
+    subject       = trow["Default_Subject"] if trow is not None else "Walmart Business Update"
+    template_body = trow["Body_Text"]       if trow is not None else ""
 
     return template_name, rule, subject, template_body, flags, clears
 
@@ -218,6 +503,61 @@ def generate_drafts(row, template_body, subject, ticket, agent_name):
     return email, sms, vm, subject
 
 
+def email_to_html(text: str) -> str:
+    """HTML body for SendGrid. Built once per draft edit and kept in session state."""
+    return text.replace("\n", "<br>")
+
+
+# ── Display frame memo ────────────────────────────────────────────────────────
+def session_frame(kind: str, key, build):
+    """Build a one-record display frame once per (org, Database frame) and reuse it
+    across reruns of the same stage. Only the latest frame per kind is kept."""
+    cache = st.session_state.frame_cache
+    hit   = cache.get(kind)
+    if hit is None or hit[0] != key:
+        hit = cache[kind] = (key, build())
+    return hit[1]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# CHANNEL SENDERS  (thread-safe: no st.session_state access, results as text)
+# ══════════════════════════════════════════════════════════════════════════════
+
+@st.cache_resource(max_entries=1, ttl=3600)   # keyed on the auth token: keep only the latest
+def get_twilio_client(sid: str, auth: str):
+    """One Twilio client (and HTTP session) per credential pair, shared by SMS + voice."""
+    from twilio.rest import Client as TwilioClient
+    return TwilioClient(sid, auth)
+
+
+def send_email(api_key, sender, to_email, subject, html):
+    try:
+        from sendgrid import SendGridAPIClient
+        from sendgrid.helpers.mail import Mail
+        mail = Mail(from_email=sender, to_emails=to_email, subject=subject, html_content=html)
+        resp = SendGridAPIClient(api_key).send(mail)
+        return f"✅ Sent to {to_email} (HTTP {resp.status_code})"
+    except Exception as e:
+        return f"❌ Failed: {e}"
+
+
+def send_sms(tw, wa_from, to_phone, body):
+    try:
+        msg = tw.messages.create(from_=wa_from, to=f"whatsapp:{to_phone}", body=body)
+        return f"✅ Sent to {to_phone} (SID: {msg.sid})"
+    except Exception as e:
+        return f"❌ Failed: {e}"
+
+
+def send_voice(tw, from_num, to_phone, script):
+    try:
+        twiml = f"<Response><Say voice='alice'>{script}</Say></Response>"
+        call  = tw.calls.create(from_=from_num, to=to_phone, twiml=twiml)
+        return f"✅ Called {to_phone} (SID: {call.sid})"
+    except Exception as e:
+        return f"❌ Failed: {e}"
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # SIDEBAR
 # ══════════════════════════════════════════════════════════════════════════════
@@ -268,8 +608,7 @@ with st.sidebar:
 
     # Write-back status
     st.divider()
-    gc_check = get_gspread_client()
-    if gc_check:
+    if gs_resources_or_none():
         st.success("✅ Sheet write-back enabled")
     else:
         st.warning(
@@ -289,11 +628,13 @@ for key, default in {
     "rule": None,
     "template_name": None,
     "email_draft": "",
+    "email_html": "",          # email_draft rendered for sending
     "sms_draft": "",
     "vm_draft": "",
     "email_subject": "",
     "ticket": None,
-    "session_log": [],         # in-memory log for this session
+    "session_log_df": pd.DataFrame(columns=SIM_COLS + ["Status"]),   # in-memory log for this session
+    "frame_cache": {},         # display frames per stage, see session_frame()
 }.items():
     if key not in st.session_state:
         st.session_state[key] = default
@@ -326,27 +667,20 @@ if st.session_state.stage == "select":
     with col_total:
         st.metric("Records", len(db))
 
-    db["_has_flag"] = (
-        (db["Org_PBI_Status"].astype(str).str.lower() == "yes") |
-        (db["Outgoing PA Tax Exempt"].astype(str).str.lower() == "yes") |
-        (db["Incoming PA existing account"].astype(str).str.lower() != "yes")
-    )
     filter_opt = st.radio("Filter", ["All", "🚩 Flagged", "✅ Clear"], horizontal=True)
-    if filter_opt == "🚩 Flagged":
-        orgs = db[db["_has_flag"]]["Org name"].tolist()
-    elif filter_opt == "✅ Clear":
-        orgs = db[~db["_has_flag"]]["Org name"].tolist()
-    else:
-        orgs = db["Org name"].tolist()
+    orgs = org_lists(db, db.attrs["load_id"])[filter_opt]
 
     selected = st.selectbox("Select an organization to process", orgs)
 
     if selected:
-        row = db[db["Org name"] == selected].iloc[0]
+        row = lookup_row(db, selected)
         preview_cols = ["Org name", "CID", "Outgoing PA name", "Outgoing PA email",
                         "Incoming PA name", "Incoming PA email", "Org_PBI_Status",
                         "Outgoing PA Tax Exempt", "Incoming PA existing account"]
-        st.dataframe(pd.DataFrame([row[preview_cols]]), use_container_width=True, hide_index=True)
+        preview_df = session_frame(
+            "preview", (selected, db.attrs["load_id"]), lambda: pd.DataFrame([row[preview_cols]])
+        )
+        st.dataframe(preview_df, use_container_width=True, hide_index=True)
 
         if st.button("▶ Run Triage", type="primary"):
             st.session_state.selected_org = selected
@@ -361,7 +695,7 @@ if st.session_state.stage == "select":
 elif st.session_state.stage == "triage":
     org    = st.session_state.selected_org
     ticket = st.session_state.ticket
-    row    = db[db["Org name"] == org].iloc[0]
+    row    = lookup_row(db, org)
 
     template_name, rule, subject, template_body, flags, clears = run_rules_engine(row, templates)
 
@@ -375,21 +709,24 @@ elif st.session_state.stage == "triage":
 
     with col_proof:
         st.markdown("**📊 Full Record — Proof of Work**")
-        proof_data = {
-            "Org name": row.get("Org name"),
-            "CID": row.get("CID"),
-            "Outgoing PA": f"{row.get('Outgoing PA name')} ({row.get('Outgoing PA email')})",
-            "Outgoing PA Phone": row.get("Outgoing PA phone"),
-            "Tax Exempt": row.get("Outgoing PA Tax Exempt"),
-            "Physical Card": row.get("Outgoing PA physical card"),
-            "Incoming PA": f"{row.get('Incoming PA name')} ({row.get('Incoming PA email')})",
-            "Incoming PA Phone": row.get("Incoming PA phone"),
-            "Incoming PA Existing Account": row.get("Incoming PA existing account"),
-            "Incoming PA Physical Card": row.get("Incoming PA Physical Card"),
-            "PBI Status": row.get("Org_PBI_Status"),
-            "Reason for Departure": row.get("Reason for departure"),
-        }
-        proof_df = pd.DataFrame(list(proof_data.items()), columns=["Field", "Value"])
+        def build_proof_df():
+            proof_data = {
+                "Org name": row.get("Org name"),
+                "CID": row.get("CID"),
+                "Outgoing PA": f"{row.get('Outgoing PA name')} ({row.get('Outgoing PA email')})",
+                "Outgoing PA Phone": row.get("Outgoing PA phone"),
+                "Tax Exempt": row.get("Outgoing PA Tax Exempt"),
+                "Physical Card": row.get("Outgoing PA physical card"),
+                "Incoming PA": f"{row.get('Incoming PA name')} ({row.get('Incoming PA email')})",
+                "Incoming PA Phone": row.get("Incoming PA phone"),
+                "Incoming PA Existing Account": row.get("Incoming PA existing account"),
+                "Incoming PA Physical Card": row.get("Incoming PA Physical Card"),
+                "PBI Status": row.get("Org_PBI_Status"),
+                "Reason for Departure": row.get("Reason for departure"),
+            }
+            return pd.DataFrame(list(proof_data.items()), columns=["Field", "Value"])
+
+        proof_df = session_frame("proof", (org, db.attrs["load_id"]), build_proof_df)
         st.dataframe(proof_df, use_container_width=True, hide_index=True, height=400)
 
     with col_flags:
@@ -413,6 +750,7 @@ elif st.session_state.stage == "triage":
                 "rule": rule,
                 "template_name": template_name,
                 "email_draft": email_d,
+                "email_html": email_to_html(email_d),
                 "sms_draft": sms_d,
                 "vm_draft": vm_d,
                 "email_subject": subj,
@@ -435,14 +773,14 @@ elif st.session_state.stage == "triage":
 elif st.session_state.stage == "override":
     org    = st.session_state.selected_org
     ticket = st.session_state.ticket
-    row    = db[db["Org name"] == org].iloc[0]
+    row    = lookup_row(db, org)
 
     st.markdown('<div class="stage-header">⚠️ Manual Template Override</div>', unsafe_allow_html=True)
     chosen          = st.selectbox("Select template", templates["Template_Name"].tolist())
     override_reason = st.text_area("Reason for override (required)")
 
     if st.button("✅ Apply & Generate Drafts", type="primary") and override_reason.strip():
-        trow  = templates[templates["Template_Name"] == chosen].iloc[0]
+        trow  = lookup_row(templates, chosen)
         email_d, sms_d, vm_d, subj = generate_drafts(
             row, trow["Body_Text"], trow["Default_Subject"], ticket, agent_name
         )
@@ -450,6 +788,7 @@ elif st.session_state.stage == "override":
             "rule": f"OVERRIDE — {override_reason}",
             "template_name": chosen,
             "email_draft": email_d,
+            "email_html": email_to_html(email_d),
             "sms_draft": sms_d,
             "vm_draft": vm_d,
             "email_subject": subj,
@@ -463,7 +802,7 @@ elif st.session_state.stage == "override":
 # ══════════════════════════════════════════════════════════════════════════════
 elif st.session_state.stage == "draft":
     org = st.session_state.selected_org
-    row = db[db["Org name"] == org].iloc[0]
+    row = lookup_row(db, org)
 
     st.markdown(f'<div class="stage-header">📝 Review & Edit Drafts — {org}</div>', unsafe_allow_html=True)
     st.caption(f"Ticket: **{st.session_state.ticket}** · Template: **{st.session_state.template_name}**")
@@ -479,7 +818,9 @@ elif st.session_state.stage == "draft":
     with tab_email:
         subj_edit  = st.text_input("Subject", value=st.session_state.email_subject)
         email_edit = st.text_area("Email Body", value=st.session_state.email_draft, height=320)
-        st.session_state.email_draft   = email_edit
+        if email_edit != st.session_state.email_draft:
+            st.session_state.email_draft = email_edit
+            st.session_state.email_html  = email_to_html(email_edit)
         st.session_state.email_subject = subj_edit
 
     with tab_sms:
@@ -522,64 +863,41 @@ elif st.session_state.stage == "draft":
 # ══════════════════════════════════════════════════════════════════════════════
 elif st.session_state.stage == "sending":
     org    = st.session_state.selected_org
-    row    = db[db["Org name"] == org].iloc[0]
+    row    = lookup_row(db, org)
     ticket = st.session_state.ticket
 
     st.markdown(f'<div class="stage-header">🚀 Sending — {org}</div>', unsafe_allow_html=True)
 
     out_email = str(row.get("Outgoing PA email", ""))
-    raw_phone = str(row.get("Outgoing PA phone", "")).replace("-", "").replace(" ", "").replace("(", "").replace(")", "")
+    raw_phone = _PHONE_STRIP.sub("", str(row.get("Outgoing PA phone", "")))
     recipient_phone = f"+1{raw_phone}" if not raw_phone.startswith("+") else raw_phone
-    results = {}
 
     progress = st.progress(0, text="Starting...")
 
-    # ── Email ──────────────────────────────────────────────────────────────────
-    progress.progress(10, text="📧 Sending email...")
-    if live_mode:
-        try:
-            sg   = SendGridAPIClient(sg_key)
-            mail = Mail(
-                from_email=sg_sender,
-                to_emails=out_email,
-                subject=st.session_state.email_subject,
-                html_content=st.session_state.email_draft.replace("\n", "<br>")
-            )
-            resp = sg.send(mail)
-            results["Email"] = f"✅ Sent to {out_email} (HTTP {resp.status_code})"
-        except Exception as e:
-            results["Email"] = f"❌ Failed: {e}"
-    else:
-        results["Email"] = f"🟡 Simulated → {out_email}"
-
-    # ── SMS ────────────────────────────────────────────────────────────────────
-    progress.progress(40, text="💬 Sending SMS...")
-    if live_mode:
-        try:
-            tw  = TwilioClient(twilio_sid, twilio_auth)
-            msg = tw.messages.create(
-                from_=f"whatsapp:+{twilio_wa.lstrip('+')}",
-                to=f"whatsapp:{recipient_phone}",
-                body=st.session_state.sms_draft
-            )
-            results["SMS"] = f"✅ Sent to {recipient_phone} (SID: {msg.sid})"
-        except Exception as e:
-            results["SMS"] = f"❌ Failed: {e}"
+    # ── Email + SMS + Voice ────────────────────────────────────────────────────
+    if not live_mode:
+        # Simulation: no API clients, no network — just record the destinations
+        results = {
+            ch: f"🟡 Simulated → {dest}"
+            for ch, dest in [("Email", out_email), ("SMS", recipient_phone), ("Voice", recipient_phone)]
+        }
     else:
-        results["SMS"] = f"🟡 Simulated → {recipient_phone}"
-
-    # ── Voice ──────────────────────────────────────────────────────────────────
-    progress.progress(70, text="📞 Initiating voice call...")
-    if live_mode:
+        # Independent calls, fired concurrently
+        progress.progress(10, text="📡 Sending email, SMS and voice call...")
+        wa_from = f"whatsapp:+{twilio_wa.lstrip('+')}"
+        results = {}
+        jobs    = {"Email": (send_email, sg_key, sg_sender, out_email,
+                             st.session_state.email_subject, st.session_state.email_html)}
         try:
-            tw   = TwilioClient(twilio_sid, twilio_auth)
-            twiml = f"<Response><Say voice='alice'>{st.session_state.vm_draft}</Say></Response>"
-            call  = tw.calls.create(from_=twilio_num, to=recipient_phone, twiml=twiml)
-            results["Voice"] = f"✅ Called {recipient_phone} (SID: {call.sid})"
-        except Exception as e:
-            results["Voice"] = f"❌ Failed: {e}"
-    else:
-        results["Voice"] = f"🟡 Simulated → {recipient_phone}"
+            tw = get_twilio_client(twilio_sid, twilio_auth)
+            jobs["SMS"]   = (send_sms, tw, wa_from, recipient_phone, st.session_state.sms_draft)
+            jobs["Voice"] = (send_voice, tw, twilio_num, recipient_phone, st.session_state.vm_draft)
+        except Exception as e:   # bad Twilio credentials: SMS + voice fail, email still goes out
+            results["SMS"] = results["Voice"] = f"❌ Failed: {e}"
+        with ThreadPoolExecutor(max_workers=3) as ex:
+            futures = {ch: ex.submit(*job) for ch, job in jobs.items()}
+            results.update({ch: f.result() for ch, f in futures.items()})
+        results = {ch: results[ch] for ch in ("Email", "SMS", "Voice")}
 
     # ── Log to Google Sheet ────────────────────────────────────────────────────
     progress.progress(88, text="📝 Logging to Google Sheet...")
@@ -602,11 +920,17 @@ elif st.session_state.stage == "sending":
         "Sent_To":       f"{out_email} / {recipient_phone}",
     }
 
-    wrote_history = append_to_sheet("Interaction_History", history_row)
-    wrote_sim     = append_to_sheet("Simulation_Log",      sim_row)
+    wrote_logs = append_rows_batch({
+        "Interaction_History": [history_row],
+        "Simulation_Log":      [sim_row],
+    })
+
+    if wrote_logs:
+        sheet_cache("Interaction_History").append_row(history_row)
+        sheet_cache("Simulation_Log").append_row(sim_row)
 
     # Always store in session memory too
-    st.session_state.session_log.append({**sim_row, "Status": status})
+    append_frame_row(st.session_state.session_log_df, {**sim_row, "Status": status})
 
     progress.progress(100, text="Done!")
     st.success(f"✅ All channels processed for **{org}** · Ticket: **{ticket}**")
@@ -616,15 +940,14 @@ elif st.session_state.stage == "sending":
         st.markdown(f"- **{ch}:** {res}")
 
     # Sheet write-back feedback
-    if wrote_history and wrote_sim:
+    if wrote_logs:
         st.success("📊 Logs written to Google Sheet automatically.")
     else:
         st.info(
             "📊 Logs not written to sheet (no service account configured). "
             "Download the session log below."
         )
-        log_df = pd.DataFrame(st.session_state.session_log)
-        csv    = log_df.to_csv(index=False).encode()
+        csv = st.session_state.session_log_df.to_csv(index=False).encode()
         st.download_button(
             "💾 Download Session Log (CSV)",
             data=csv,
@@ -650,7 +973,7 @@ elif st.session_state.stage == "sending":
 elif st.session_state.stage == "reject":
     org    = st.session_state.selected_org
     ticket = st.session_state.ticket
-    row    = db[db["Org name"] == org].iloc[0]
+    row    = lookup_row(db, org)
 
     st.markdown(f'<div class="stage-header">🚫 Reject — {org}</div>', unsafe_allow_html=True)
     reason = st.text_area("Reason for rejection (required)")
@@ -663,8 +986,9 @@ elif st.session_state.stage == "reject":
             "Action_Taken": reason,
             "Sent_To": "N/A",
         }
-        append_to_sheet("Simulation_Log", sim_row)
-        st.session_state.session_log.append(sim_row)
+        if append_rows_batch({"Simulation_Log": [sim_row]}):
+            sheet_cache("Simulation_Log").append_row(sim_row)
+        append_frame_row(st.session_state.session_log_df, sim_row)
         st.success("Rejection logged.")
         if st.button("← Back to Records"):
             st.session_state.stage = "select"
@@ -674,10 +998,8 @@ elif st.session_state.stage == "reject":
 # ══════════════════════════════════════════════════════════════════════════════
 # BOTTOM: SESSION AUDIT TRAIL
 # ══════════════════════════════════════════════════════════════════════════════
-if st.session_state.session_log:
+session_log_df = st.session_state.session_log_df
+if not session_log_df.empty:
     st.divider()
-    with st.expander(f"📋 Session Log ({len(st.session_state.session_log)} action(s))", expanded=False):
-        st.dataframe(
-            pd.DataFrame(st.session_state.session_log),
-            use_container_width=True, hide_index=True
-        )
+    with st.expander(f"📋 Session Log ({len(session_log_df)} action(s))", expanded=False):
+        st.dataframe(session_log_df, use_container_width=True, hide_index=True)